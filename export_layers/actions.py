@@ -14,7 +14,9 @@ These events include:
   * calling `clear()` before resetting actions (due to initial actions
     being added back).
   
-  Arguments: action dictionary to be added
+  Arguments: action dictionary to be added. When calling `add()`, this is a
+  copy of the passed dictionary that event handlers may modify before the
+  action is created.
 
 * `'after-add-action'` - invoked when:
   * calling `add()` after adding an action,
@@ -24,7 +26,9 @@ These events include:
     being added back).
   
   Arguments: created action, original action dictionary (same as in
-  `'before-add-action'`)
+  `'before-add-action'`). When calling `add()`, this is a separate copy made
+  before any modifications, hence it never contains the uniquified name or
+  display name. The dictionary should be treated as read-only.
 
 * `'before-reorder-action'` - invoked when calling `reorder()` before
   reordering an action.
@@ -72,7 +76,57 @@ DEFAULT_PROCEDURES_GROUP = 'default_procedures'
 DEFAULT_CONSTRAINTS_GROUP = 'default_constraints'
 
 _DEFAULT_ACTION_TYPE = 'procedure'
-_REQUIRED_ACTION_FIELDS = ['name']
+_REQUIRED_ACTION_FIELDS = frozenset(['name'])
+
+# Attributes of settings created for each action, except default values.
+_ACTION_SETTING_TEMPLATES = {
+  'function': {
+    'type': pg.SettingTypes.generic,
+    'name': 'function',
+    'setting_sources': None,
+  },
+  'enabled': {
+    'type': pg.SettingTypes.boolean,
+    'name': 'enabled',
+  },
+  'display_name': {
+    'type': pg.SettingTypes.string,
+    'name': 'display_name',
+    'gui_type': None,
+    'tags': ['ignore_initialize_gui'],
+  },
+  'description': {
+    'type': pg.SettingTypes.string,
+    'name': 'description',
+    'gui_type': None,
+  },
+  'action_groups': {
+    'type': pg.SettingTypes.generic,
+    'name': 'action_groups',
+    'gui_type': None,
+  },
+  'more_options_expanded': {
+    'type': pg.SettingTypes.boolean,
+    'name': 'more_options_expanded',
+    'display_name': _('_More options'),
+    'gui_type': pg.SettingGuiTypes.expander,
+  },
+  'enabled_for_previews': {
+    'type': pg.SettingTypes.boolean,
+    'name': 'enabled_for_previews',
+    'display_name': _('Enable for previews'),
+  },
+  'orig_name': {
+    'type': pg.SettingTypes.string,
+    'name': 'orig_name',
+    'gui_type': None,
+  },
+}
+
+_CUSTOM_FIELD_SETTING_TEMPLATE = {
+  'type': pg.SettingTypes.generic,
+  'gui_type': None,
+}
 
 
 def create(name, initial_actions=None):
@@ -176,6 +230,11 @@ def create(name, initial_actions=None):
     },
   ])
   
+  # key: action type; value: tuple of actions as yielded by `walk()`
+  actions._walk_cache = {}
+  # key: action name; value: index in `_added_data`. Rebuilt lazily if `None`.
+  actions._added_data_indexes = None
+  
   _create_actions_from_added_data(actions)
   
   actions.connect_event(
@@ -221,8 +280,9 @@ def _create_actions_from_added_data(actions):
   for action_dict in actions['_added_data'].value:
     actions.invoke_event('before-add-action', action_dict)
     
-    action = _create_action_by_type(**dict(action_dict))
+    action = _create_action_by_type(**action_dict)
     actions['added'].add([action])
+    _invalidate_caches(actions)
     
     actions.invoke_event('after-add-action', action, action_dict)
 
@@ -230,29 +290,38 @@ def _create_actions_from_added_data(actions):
 def _create_action_by_type(**kwargs):
   type_ = kwargs.pop('type', _DEFAULT_ACTION_TYPE)
   
-  if type_ not in _ACTION_TYPES_AND_FUNCTIONS:
+  create_action_func = _ACTION_TYPES_AND_FUNCTIONS.get(type_)
+  if create_action_func is None:
     raise ValueError(
       'invalid type "{}"; valid values: {}'.format(
         type_, list(_ACTION_TYPES_AND_FUNCTIONS)))
   
-  for required_field in _REQUIRED_ACTION_FIELDS:
-    if required_field not in kwargs:
-      raise ValueError('missing required field: "{}"'.format(required_field))
+  missing_fields = _REQUIRED_ACTION_FIELDS.difference(kwargs)
+  if missing_fields:
+    raise ValueError('missing required field: "{}"'.format(sorted(missing_fields)[0]))
   
-  return _ACTION_TYPES_AND_FUNCTIONS[type_](**kwargs)
+  return create_action_func(**kwargs)
 
 
 def _get_values_from_actions(added_data_values_setting, added_actions_group):
   added_data_values_setting.reset()
   
+  added_data_values = added_data_values_setting.value
+  
   for setting in added_actions_group.walk():
-    added_data_values_setting.value[setting.get_path(added_actions_group)] = setting.value
+    added_data_values[setting.get_path(added_actions_group)] = setting.value
 
 
 def _set_values_for_actions(added_data_values_setting, added_actions_group):
+  added_data_values = added_data_values_setting.value
+  
   for setting in added_actions_group.walk():
-    if setting.get_path(added_actions_group) in added_data_values_setting.value:
-      setting.set_value(added_data_values_setting.value[setting.get_path(added_actions_group)])
+    try:
+      value = added_data_values[setting.get_path(added_actions_group)]
+    except KeyError:
+      pass
+    else:
+      setting.set_value(value)
 
 
 def _create_action(
@@ -267,12 +336,6 @@ def _create_action(
       more_options_expanded=False,
       enabled_for_previews=True,
       **custom_fields):
-  
-  def _set_display_name_for_enabled_gui(setting_enabled, setting_display_name):
-    setting_display_name.set_gui(
-      gui_type=pg.setting.SettingGuiTypes.check_button_label,
-      gui_element=setting_enabled.gui.element)
-  
   action = pg.setting.Group(
     name,
     tags=tags,
@@ -292,71 +355,26 @@ def _create_action(
     arguments_group.add(arguments)
   
   action.add([
-    {
-      'type': pg.SettingTypes.generic,
-      'name': 'function',
-      'default_value': function,
-      'setting_sources': None,
-    },
+    dict(_ACTION_SETTING_TEMPLATES['function'], default_value=function),
     arguments_group,
-    {
-      'type': pg.SettingTypes.boolean,
-      'name': 'enabled',
-      'default_value': enabled,
-    },
-    {
-      'type': pg.SettingTypes.string,
-      'name': 'display_name',
-      'default_value': display_name,
-      'gui_type': None,
-      'tags': ['ignore_initialize_gui'],
-    },
-    {
-      'type': pg.SettingTypes.string,
-      'name': 'description',
-      'default_value': description,
-      'gui_type': None,
-    },
-    {
-      'type': pg.SettingTypes.generic,
-      'name': 'action_groups',
-      'default_value': action_groups,
-      'gui_type': None,
-    },
-    {
-      "type": pg.SettingTypes.boolean,
-      "name": 'more_options_expanded',
-      "default_value": more_options_expanded,
-      "display_name": _('_More options'),
-      "gui_type": pg.SettingGuiTypes.expander,
-    },
-    {
-      "type": pg.SettingTypes.boolean,
-      "name": 'enabled_for_previews',
-      "default_value": enabled_for_previews,
-      "display_name": _('Enable for previews'),
-    },
+    dict(_ACTION_SETTING_TEMPLATES['enabled'], default_value=enabled),
+    dict(_ACTION_SETTING_TEMPLATES['display_name'], default_value=display_name),
+    dict(_ACTION_SETTING_TEMPLATES['description'], default_value=description),
+    dict(_ACTION_SETTING_TEMPLATES['action_groups'], default_value=action_groups),
+    dict(
+      _ACTION_SETTING_TEMPLATES['more_options_expanded'],
+      default_value=more_options_expanded),
+    dict(
+      _ACTION_SETTING_TEMPLATES['enabled_for_previews'],
+      default_value=enabled_for_previews),
   ])
   
   orig_name_value = custom_fields.pop('orig_name', name)
-  action.add([
-    {
-      'type': pg.SettingTypes.string,
-      'name': 'orig_name',
-      'default_value': orig_name_value,
-      'gui_type': None,
-    },
-  ])
   
-  for field_name, field_value in custom_fields.items():
-    action.add([
-      {
-        'type': pg.SettingTypes.generic,
-        'name': field_name,
-        'default_value': field_value,
-        'gui_type': None,
-      },
-    ])
+  action.add(
+    [dict(_ACTION_SETTING_TEMPLATES['orig_name'], default_value=orig_name_value)]
+    + [dict(_CUSTOM_FIELD_SETTING_TEMPLATE, name=field_name, default_value=field_value)
+       for field_name, field_value in custom_fields.items()])
   
   action['enabled'].connect_event(
     'after-set-gui',
@@ -364,12 +382,21 @@ def _create_action(
     action['display_name'])
   
   if action.get_value('is_pdb_procedure', True):
-    _connect_events_to_sync_array_and_array_length_arguments(action)
-    _hide_gui_for_run_mode_and_array_length_arguments(action)
+    array_length_and_array_settings = _get_array_length_and_array_settings(action)
+    _connect_events_to_sync_array_and_array_length_arguments(
+      array_length_and_array_settings)
+    _hide_gui_for_run_mode_and_array_length_arguments(
+      action, array_length_and_array_settings)
   
   return action
 
 
+def _set_display_name_for_enabled_gui(setting_enabled, setting_display_name):
+  setting_display_name.set_gui(
+    gui_type=pg.setting.SettingGuiTypes.check_button_label,
+    gui_element=setting_enabled.gui.element)
+
+
 def _create_procedure(
       name,
       function,
@@ -424,7 +451,8 @@ def _create_constraint(
   return constraint
 
 
-def _connect_events_to_sync_array_and_array_length_arguments(action):
+def _connect_events_to_sync_array_and_array_length_arguments(
+      array_length_and_array_settings):
   
   def _increment_array_length(
         array_setting, insertion_index, value, array_length_setting):
@@ -434,19 +462,20 @@ def _connect_events_to_sync_array_and_array_length_arguments(action):
         array_setting, insertion_index, array_length_setting):
     array_length_setting.set_value(array_length_setting.value - 1)
   
-  for length_setting, array_setting in _get_array_length_and_array_settings(action):
+  for length_setting, array_setting in array_length_and_array_settings:
     array_setting.connect_event(
       'after-add-element', _increment_array_length, length_setting)
     array_setting.connect_event(
       'before-delete-element', _decrement_array_length, length_setting)
 
 
-def _hide_gui_for_run_mode_and_array_length_arguments(action):
+def _hide_gui_for_run_mode_and_array_length_arguments(
+      action, array_length_and_array_settings):
   first_argument = next(iter(action['arguments']), None)
   if first_argument is not None and first_argument.display_name == 'run-mode':
     first_argument.gui.set_visible(False)
   
-  for length_setting, unused_ in _get_array_length_and_array_settings(action):
+  for length_setting, unused_ in array_length_and_array_settings:
     length_setting.gui.set_visible(False)
 
 
@@ -468,6 +497,8 @@ _ACTION_TYPES_AND_FUNCTIONS = {
   'constraint': _create_constraint
 }
 
+_ACTION_TYPES = frozenset(_ACTION_TYPES_AND_FUNCTIONS)
+
 
 def add(actions, action_dict_or_function):
   """
@@ -505,6 +536,7 @@ def add(actions, action_dict_or_function):
   
   actions['added'].add([action])
   actions['_added_data'].value.append(action_dict)
+  _invalidate_caches(actions)
   
   actions.invoke_event('after-add-action', action, orig_action_dict)
   
@@ -525,13 +557,6 @@ def get_action_dict_for_pdb_procedure(pdb_procedure):
   `pygimplib.setting.Setting` instances, whose names must be unique within a
   setting group).
   """
-  
-  def _generate_unique_pdb_procedure_argument_name():
-    i = 2
-    while True:
-      yield '-{}'.format(i)
-      i += 1
-  
   action_dict = {
     'name': pg.utils.safe_decode_gimp(pdb_procedure.proc_name),
     'function': pg.utils.safe_decode_gimp(pdb_procedure.proc_name),
@@ -540,7 +565,7 @@ def get_action_dict_for_pdb_procedure(pdb_procedure):
     'is_pdb_procedure': True,
   }
   
-  pdb_procedure_argument_names = []
+  pdb_procedure_argument_names = set()
   
   for index, (pdb_param_type, pdb_param_name, unused_) in enumerate(pdb_procedure.params):
     processed_pdb_param_name = pg.utils.safe_decode_gimp(pdb_param_name)
@@ -555,7 +580,7 @@ def get_action_dict_for_pdb_procedure(pdb_procedure):
       pdb_procedure_argument_names,
       uniquifier_generator=_generate_unique_pdb_procedure_argument_name())
     
-    pdb_procedure_argument_names.append(unique_pdb_param_name)
+    pdb_procedure_argument_names.add(unique_pdb_param_name)
     
     if isinstance(setting_type, dict):
       arguments_dict = dict(setting_type)
@@ -580,52 +605,64 @@ def get_action_dict_for_pdb_procedure(pdb_procedure):
   return action_dict
 
 
+def _generate_unique_pdb_procedure_argument_name():
+  i = 2
+  while True:
+    yield '-{}'.format(i)
+    i += 1
+
+
 def _uniquify_name_and_display_name(actions, action_dict):
+  existing_names = set()
+  existing_display_names = set()
+  
+  for action in walk(actions):
+    existing_names.add(action.name)
+    existing_display_names.add(action['display_name'].value)
+  
   action_dict['orig_name'] = action_dict['name']
   
   action_dict['name'] = _uniquify_action_name(
-    actions, action_dict['name'])
+    action_dict['name'], existing_names)
   
   action_dict['display_name'] = _uniquify_action_display_name(
-    actions, action_dict['display_name'])
+    action_dict['display_name'], existing_display_names)
 
 
-def _uniquify_action_name(actions, name):
+def _uniquify_action_name(name, existing_names):
   """
-  Return `name` modified to not match the name of any existing action in
-  `actions`.
+  Return `name` modified to not match any name in `existing_names`, i.e. the
+  name of any existing action.
   """
-  
-  def _generate_unique_action_name():
-    i = 2
-    while True:
-      yield '_{}'.format(i)
-      i += 1
-  
-  return (
-    pg.path.uniquify_string(
-      name,
-      [action.name for action in walk(actions)],
-      uniquifier_generator=_generate_unique_action_name()))
+  return pg.path.uniquify_string(
+    name,
+    existing_names,
+    uniquifier_generator=_generate_unique_action_name())
 
 
-def _uniquify_action_display_name(actions, display_name):
+def _uniquify_action_display_name(display_name, existing_display_names):
   """
-  Return `display_name` modified to not match the display name of any existing
-  action in `actions`.
+  Return `display_name` modified to not match any display name in
+  `existing_display_names`, i.e. the display name of any existing action.
   """
-  
-  def _generate_unique_display_name():
-    i = 2
-    while True:
-      yield ' ({})'.format(i)
-      i += 1
-  
-  return (
-    pg.path.uniquify_string(
-      display_name,
-      [action['display_name'].value for action in walk(actions)],
-      uniquifier_generator=_generate_unique_display_name()))
+  return pg.path.uniquify_string(
+    display_name,
+    existing_display_names,
+    uniquifier_generator=_generate_unique_display_name())
+
+
+def _generate_unique_action_name():
+  i = 2
+  while True:
+    yield '_{}'.format(i)
+    i += 1
+
+
+def _generate_unique_display_name():
+  i = 2
+  while True:
+    yield ' ({})'.format(i)
+    i += 1
 
 
 def reorder(actions, action_name, new_position):
@@ -649,12 +686,21 @@ def reorder(actions, action_name, new_position):
   
   actions.invoke_event('before-reorder-action', action, current_position)
   
-  action_dict = actions['_added_data'].value.pop(current_position)
+  added_data = actions['_added_data'].value
   
   if new_position < 0:
-    new_position = max(len(actions['_added_data'].value) + new_position + 1, 0)
+    new_position = max(len(added_data) + new_position, 0)
+  
+  if (abs(new_position - current_position) == 1
+      and new_position < len(added_data)):
+    # Moving an action by one position (the most common case when reordering
+    # via GUI) is a swap of two neighboring elements.
+    added_data[current_position], added_data[new_position] = (
+      added_data[new_position], added_data[current_position])
+  else:
+    added_data.insert(new_position, added_data.pop(current_position))
   
-  actions['_added_data'].value.insert(new_position, action_dict)
+  _invalidate_caches(actions)
   
   actions.invoke_event(
     'after-reorder-action', action, current_position, new_position)
@@ -679,15 +725,18 @@ def remove(actions, action_name):
   
   actions['added'].remove([action_name])
   del actions['_added_data'].value[action_index]
+  _invalidate_caches(actions)
   
   actions.invoke_event('after-remove-action', action_name)
 
 
 def _find_index_in_added_data(actions, action_name):
-  return next(
-    (index for index, dict_ in enumerate(actions['_added_data'].value)
-     if dict_['name'] == action_name),
-    None)
+  if actions._added_data_indexes is None:
+    actions._added_data_indexes = {
+      dict_['name']: index
+      for index, dict_ in enumerate(actions['_added_data'].value)}
+  
+  return actions._added_data_indexes.get(action_name)
 
 
 def clear(actions):
@@ -702,9 +751,10 @@ def clear(actions):
 
 
 def _clear(actions):
-  actions['added'].remove([action.name for action in walk(actions)])
+  actions['added'].remove([action.name for action in actions['added']])
   actions['_added_data'].reset()
   actions['_added_data_values'].reset()
+  _invalidate_caches(actions)
 
 
 def walk(actions, action_type=None, setting_name=None):
@@ -723,34 +773,47 @@ def walk(actions, action_type=None, setting_name=None):
   each action. For example, `'enabled'` yields the `'enabled'` setting for
   each action. For the list of possible names of settings and subgroups, see
   `create()`.
-  """
-  action_types = list(_ACTION_TYPES_AND_FUNCTIONS)
   
-  if action_type is not None and action_type not in action_types:
+  Actions matching `action_type` are cached until actions are added, removed,
+  reordered or cleared.
+  """
+  if action_type is not None and action_type not in _ACTION_TYPES:
     raise ValueError('invalid action type "{}"'.format(action_type))
   
-  def has_matching_type(setting):
-    if action_type is None:
-      return any(type_ in setting.tags for type_ in action_types)
-    else:
-      return action_type in setting.tags
+  try:
+    listed_actions = actions._walk_cache[action_type]
+  except KeyError:
+    listed_actions = _get_actions_in_order(actions, action_type)
+    actions._walk_cache[action_type] = listed_actions
   
-  listed_actions = {
-    setting.name: setting
-    for setting in actions['added'].walk(
-      include_setting_func=has_matching_type,
-      include_groups=True,
-      include_if_parent_skipped=True)}
+  if setting_name is None:
+    return iter(listed_actions)
+  else:
+    return (
+      action[setting_name] for action in listed_actions if setting_name in action)
+
+
+def _get_actions_in_order(actions, action_type):
+  if action_type is None:
+    action_types = _ACTION_TYPES
+  else:
+    action_types = frozenset([action_type])
+  
+  added_actions = actions['added']
+  listed_actions = []
   
   for action_dict in actions['_added_data'].value:
-    if action_dict['name'] in listed_actions:
-      action = listed_actions[action_dict['name']]
-      
-      if setting_name is None:
-        yield action
-      else:
-        if setting_name in action:
-          yield action[setting_name]
+    if action_dict['name'] in added_actions:
+      action = added_actions[action_dict['name']]
+      if not action_types.isdisjoint(action.tags):
+        listed_actions.append(action)
+  
+  return tuple(listed_actions)
+
+
+def _invalidate_caches(actions):
+  actions._walk_cache.clear()
+  actions._added_data_indexes = None
 
 
 class UnsupportedPdbProcedureError(Exception):
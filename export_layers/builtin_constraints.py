@@ -35,7 +35,7 @@ def is_top_level(item):
 
 def has_tags(item, tags=None):
   if tags:
-    return any(tag for tag in tags if tag in item.tags)
+    return not item.tags.isdisjoint(tags)
   else:
     return bool(item.tags)
 
@@ -49,7 +49,7 @@ def has_matching_file_extension(item, file_extension):
 
 
 def has_matching_default_file_extension(item, exporter):
-  return item.get_file_extension().lower() == exporter.default_file_extension.lower()
+  return item.get_file_extension().lower() == exporter.default_file_extension_lowercase
 
 
 def is_item_in_selected_items(item, selected_layers):
@@ -136,7 +136,7 @@ _BUILTIN_CONSTRAINTS_LIST = [
       {
         'type': pg.SettingTypes.generic,
         'name': 'selected_layers',
-        'default_value': set(),
+        'default_value': frozenset(),
         'gui_type': None,
       },
     ],
@@ -110,6 +110,7 @@ class LayerExporter(object):
       export_context_manager_args if export_context_manager_args is not None else [])
     
     self._default_file_extension = None
+    self._default_file_extension_lowercase = None
     self._file_extension_properties = None
     
     self.current_file_extension = None
@@ -188,6 +189,10 @@ class LayerExporter(object):
   def default_file_extension(self):
     return self._default_file_extension
   
+  @property
+  def default_file_extension_lowercase(self):
+    return self._default_file_extension_lowercase
+  
   @property
   def file_extension_properties(self):
     return self._file_extension_properties
@@ -331,7 +336,7 @@ class LayerExporter(object):
     if function is None:
       return
     
-    if tags is not None and not any(tag in action.tags for tag in tags):
+    if tags is not None and action.tags.isdisjoint(tags):
       return
     
     orig_function = function
@@ -462,6 +467,7 @@ class LayerExporter(object):
     self.progress_updater.reset()
     
     self._default_file_extension = self.export_settings['file_extension'].value
+    self._default_file_extension_lowercase = self._default_file_extension.lower()
     self._file_extension_properties = _FileExtensionProperties()
     
     self.current_file_extension = self._default_file_extension
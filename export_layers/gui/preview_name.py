@@ -5,7 +5,9 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 from future.builtins import *
 
+import bisect
 import collections
+import contextlib
 import os
 
 import pygtk
@@ -59,11 +61,11 @@ class ExportNamePreview(preview_base_.ExportPreview):
     _COLUMN_ITEM_NAME_SENSITIVE,
     _COLUMN_ITEM_NAME,
     _COLUMN_ITEM_ID) = (
-    [0, gtk.gdk.Pixbuf],
-    [1, gobject.TYPE_BOOLEAN],
-    [2, gobject.TYPE_BOOLEAN],
-    [3, gobject.TYPE_STRING],
-    [4, gobject.TYPE_INT])
+      0, 1, 2, 3, 4)
+  
+  _COLUMN_TYPES = [
+    gtk.gdk.Pixbuf, gobject.TYPE_BOOLEAN, gobject.TYPE_BOOLEAN, gobject.TYPE_STRING,
+    gobject.TYPE_INT]
   
   def __init__(
         self,
@@ -79,6 +81,8 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._initial_item_tree = initial_item_tree
     self._collapsed_items = collapsed_items if collapsed_items is not None else set()
     self._selected_items = selected_items if selected_items is not None else []
+    # Allows fast membership tests when filtering or computing sensitivity.
+    self._selected_items_set = set(self._selected_items)
     self._selected_items_filter_name = selected_items_filter_name
     self._available_tags_setting = available_tags_setting
     
@@ -86,9 +90,11 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._is_item_in_selected_items_rule = None
     self._selected_items_filter_rules = []
     
-    self._tree_iters = collections.defaultdict(pg.utils.return_none_func)
+    self._tree_iters = {}
+    
+    self._used_tags_counts = collections.Counter()
+    self._item_tree_for_used_tags = None
     
-    self._row_expand_collapse_interactive = True
     self._toggle_tag_interactive = True
     self._clearing_preview = False
     self._row_select_interactive = True
@@ -148,7 +154,10 @@ class ExportNamePreview(preview_base_.ExportPreview):
     Clear the entire preview.
     """
     self._clearing_preview = True
-    self._tree_model.clear()
+    # Replacing the model is faster than removing each row from the existing
+    # model, which emits a signal for each removed row.
+    self._tree_model = self._create_tree_model()
+    self._tree_view.set_model(self._tree_model)
     self._tree_iters.clear()
     self._clearing_preview = False
   
@@ -164,6 +173,7 @@ class ExportNamePreview(preview_base_.ExportPreview):
     Set the selection of items in the preview.
     """
     self._selected_items = selected_items
+    self._update_selected_items_set()
     self._set_selection()
     self.emit('preview-selection-changed')
   
@@ -196,7 +206,7 @@ class ExportNamePreview(preview_base_.ExportPreview):
     return self._selected_items
   
   def _init_gui(self):
-    self._tree_model = gtk.TreeStore(*[column[1] for column in self._COLUMNS])
+    self._tree_model = self._create_tree_model()
     
     self._tree_view = gtk.TreeView(model=self._tree_model)
     self._tree_view.set_headers_visible(False)
@@ -211,21 +221,21 @@ class ExportNamePreview(preview_base_.ExportPreview):
     
     cell_renderer_icon_item = gtk.CellRendererPixbuf()
     column.pack_start(cell_renderer_icon_item, expand=False)
-    column.set_attributes(cell_renderer_icon_item, pixbuf=self._COLUMN_ICON_ITEM[0])
+    column.set_attributes(cell_renderer_icon_item, pixbuf=self._COLUMN_ICON_ITEM)
     
     cell_renderer_icon_tag = gtk.CellRendererPixbuf()
     cell_renderer_icon_tag.set_property('pixbuf', self._icons['tag'])
     column.pack_start(cell_renderer_icon_tag, expand=False)
     column.set_attributes(
       cell_renderer_icon_tag,
-      visible=self._COLUMN_ICON_TAG_VISIBLE[0])
+      visible=self._COLUMN_ICON_TAG_VISIBLE)
     
     cell_renderer_item_name = gtk.CellRendererText()
     column.pack_start(cell_renderer_item_name, expand=False)
     column.set_attributes(
       cell_renderer_item_name,
-      text=self._COLUMN_ITEM_NAME[0],
-      sensitive=self._COLUMN_ITEM_NAME_SENSITIVE[0])
+      text=self._COLUMN_ITEM_NAME,
+      sensitive=self._COLUMN_ITEM_NAME_SENSITIVE)
     
     self._tree_view.append_column(column)
     
@@ -240,6 +250,9 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._tree_view.get_selection().connect('changed', self._on_tree_selection_changed)
     self._tree_view.connect('event', self._on_tree_view_right_button_press_event)
   
+  def _create_tree_model(self):
+    return gtk.TreeStore(*self._COLUMN_TYPES)
+  
   def _init_icons(self):
     self._icons = {}
     self._icons['item_group'] = self._tree_view.render_icon(
@@ -273,6 +286,11 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._tags_menu_items = {}
     self._tags_remove_submenu_items = {}
     
+    # Sort keys of tags in the order of menu items, allowing to insert new menu
+    # items at the correct position without re-sorting the menus.
+    self._tags_menu_sort_keys = []
+    self._tags_remove_submenu_sort_keys = []
+    
     self._tags_menu_relative_position = None
     
     self._tags_menu = gtk.Menu()
@@ -294,17 +312,14 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._tags_menu.show_all()
   
   def _update_available_tags(self):
-    self._exporter.item_tree.is_filtered = False
-    
-    used_tags = set()
-    for item in self._exporter.item_tree:
-      for tag in item.tags:
-        used_tags.add(tag)
-        if tag not in self._tags_menu_items:
-          self._add_tag_menu_item(tag, tag)
-          self._add_remove_tag_menu_item(tag, tag)
+    if self._exporter.item_tree is not self._item_tree_for_used_tags:
+      self._count_used_tags()
     
-    self._exporter.item_tree.is_filtered = True
+    used_tags = set(tag for tag, count in self._used_tags_counts.items() if count > 0)
+    for tag in used_tags:
+      if tag not in self._tags_menu_items:
+        self._add_tag_menu_item(tag, tag)
+        self._add_remove_tag_menu_item(tag, tag)
     
     for tag, menu_item in self._tags_remove_submenu_items.items():
       menu_item.set_sensitive(tag not in used_tags)
@@ -317,27 +332,45 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._menu_item_remove_tag.set_sensitive(
       bool(self._tags_remove_submenu.get_children()))
     
-    self._sort_tags_menu_items()
+    available_tags_changed = False
     
     for tag in self._tags_menu_items:
       if tag not in self._available_tags_setting.value:
         self._available_tags_setting.value[tag] = tag
+        available_tags_changed = True
     
-    self._available_tags_setting.save()
+    if available_tags_changed:
+      self._available_tags_setting.save()
   
-  def _sort_tags_menu_items(self):
-    for new_tag_position, tag in (
-          enumerate(sorted(self._tags_menu_items, key=lambda tag: tag.lower()))):
-      self._tags_menu.reorder_child(self._tags_menu_items[tag], new_tag_position)
-      if tag in self._tags_remove_submenu_items:
-        self._tags_remove_submenu.reorder_child(
-          self._tags_remove_submenu_items[tag], new_tag_position)
+  def _count_used_tags(self):
+    """
+    Count the number of items each tag is assigned to, regardless of item
+    filtering.
+    
+    The counts are updated incrementally as tags are toggled in the preview and
+    fully recounted only if the item tree is replaced.
+    """
+    item_tree = self._exporter.item_tree
+    
+    self._used_tags_counts.clear()
+    
+    is_filtered = item_tree.is_filtered
+    item_tree.is_filtered = False
+    
+    try:
+      for item in item_tree:
+        self._used_tags_counts.update(item.tags)
+    finally:
+      item_tree.is_filtered = is_filtered
+    
+    self._item_tree_for_used_tags = item_tree
   
   def _add_tag_menu_item(self, tag, tag_display_name):
     self._tags_menu_items[tag] = gtk.CheckMenuItem(tag_display_name)
     self._tags_menu_items[tag].connect('toggled', self._on_tags_menu_item_toggled, tag)
     self._tags_menu_items[tag].show()
-    self._tags_menu.prepend(self._tags_menu_items[tag])
+    self._tags_menu.insert(
+      self._tags_menu_items[tag], _insert_sort_key(self._tags_menu_sort_keys, tag))
     
     return self._tags_menu_items[tag]
   
@@ -346,7 +379,9 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._tags_remove_submenu_items[tag].connect(
       'activate', self._on_tags_remove_submenu_item_activate, tag)
     self._tags_remove_submenu_items[tag].show()
-    self._tags_remove_submenu.prepend(self._tags_remove_submenu_items[tag])
+    self._tags_remove_submenu.insert(
+      self._tags_remove_submenu_items[tag],
+      _insert_sort_key(self._tags_remove_submenu_sort_keys, tag))
   
   def _on_tree_view_right_button_press_event(self, tree_view, event):
     if event.type == gtk.gdk.BUTTON_PRESS and event.button == 3:
@@ -392,9 +427,12 @@ class ExportNamePreview(preview_base_.ExportPreview):
         item = self._exporter.item_tree[item_id]
         
         if tags_menu_item.get_active():
+          if tag not in item.tags:
+            self._used_tags_counts[tag] += 1
           item.add_tag(tag)
         else:
           item.remove_tag(tag)
+          self._used_tags_counts[tag] -= 1
       
       pdb.gimp_image_undo_group_end(self._exporter.image)
       
@@ -468,6 +506,8 @@ class ExportNamePreview(preview_base_.ExportPreview):
     
     del self._tags_menu_items[tag]
     del self._tags_remove_submenu_items[tag]
+    self._tags_menu_sort_keys.remove(_get_tag_sort_key(tag))
+    self._tags_remove_submenu_sort_keys.remove(_get_tag_sort_key(tag))
     del self._available_tags_setting.value[tag]
     
     self._menu_item_remove_tag.set_sensitive(
@@ -476,28 +516,27 @@ class ExportNamePreview(preview_base_.ExportPreview):
     self._available_tags_setting.save()
   
   def _on_tree_view_row_collapsed(self, tree_view, tree_iter, tree_path):
-    if self._row_expand_collapse_interactive:
-      self._collapsed_items.add(self._get_item_id(tree_iter))
-      self._tree_view.columns_autosize()
+    self._collapsed_items.add(self._get_item_id(tree_iter))
+    self._tree_view.columns_autosize()
   
   def _on_tree_view_row_expanded(self, tree_view, tree_iter, tree_path):
-    if self._row_expand_collapse_interactive:
-      item_id = self._get_item_id(tree_iter)
-      if item_id in self._collapsed_items:
-        self._collapsed_items.remove(item_id)
-      
-      self._set_expanded_items(tree_path)
-      
-      self._tree_view.columns_autosize()
+    item_id = self._get_item_id(tree_iter)
+    if item_id in self._collapsed_items:
+      self._collapsed_items.remove(item_id)
+    
+    self._set_expanded_items(tree_path)
+    
+    self._tree_view.columns_autosize()
   
   def _on_tree_selection_changed(self, tree_selection):
     if not self._clearing_preview and self._row_select_interactive:
-      previous_selected_items = self._selected_items
+      previous_selected_items_set = set(self._selected_items_set)
       self._selected_items = self._get_item_ids_in_current_selection()
+      self._update_selected_items_set()
       
       self.emit('preview-selection-changed')
       
-      if self.is_filtering and self._selected_items != previous_selected_items:
+      if self.is_filtering and self._selected_items_set != previous_selected_items_set:
         self.update(update_existing_contents_only=True)
   
   def _get_item_ids_in_current_selection(self):
@@ -507,7 +546,7 @@ class ExportNamePreview(preview_base_.ExportPreview):
       for tree_path in tree_paths]
   
   def _get_item_id(self, tree_iter):
-    return self._tree_model.get_value(tree_iter, column=self._COLUMN_ITEM_ID[0])
+    return self._tree_model.get_value(tree_iter, column=self._COLUMN_ITEM_ID)
   
   def _process_items(self, reset_items=False):
     if not reset_items:
@@ -527,18 +566,44 @@ class ExportNamePreview(preview_base_.ExportPreview):
       is_preview=True)
   
   def _update_items(self):
+    updated_parent_item_ids = set()
+    
     for item in self._exporter.item_tree:
-      self._update_parent_items(item)
+      self._update_parent_items(item, updated_parent_item_ids)
       self._update_item(item)
   
   def _insert_items(self):
-    for item in self._exporter.item_tree:
-      self._insert_parent_items(item)
-      self._insert_item(item)
+    with self._detached_tree_model():
+      for item in self._exporter.item_tree:
+        self._insert_parent_items(item)
+        self._insert_item(item)
+  
+  @contextlib.contextmanager
+  def _detached_tree_model(self):
+    """
+    Temporarily detach the tree model from the tree view so that modifying many
+    rows does not make the tree view process each row change separately.
+    
+    The expanded state and the selection of rows are not preserved.
+    """
+    row_select_interactive = self._row_select_interactive
+    self._row_select_interactive = False
+    
+    self._tree_view.set_model(None)
+    
+    try:
+      yield
+    finally:
+      self._tree_view.set_model(self._tree_model)
+      
+      self._row_select_interactive = row_select_interactive
   
   def _insert_item(self, item):
-    if item.parent:
-      parent_tree_iter = self._tree_iters[item.parent.raw.ID]
+    item_id = item.raw.ID
+    parent_item = item.parent
+    
+    if parent_item:
+      parent_tree_iter = self._tree_iters[parent_item.raw.ID]
     else:
       parent_tree_iter = None
     
@@ -548,36 +613,64 @@ class ExportNamePreview(preview_base_.ExportPreview):
        bool(item.tags),
        True,
        pg.utils.safe_encode_gtk(item.name),
-       item.raw.ID])
-    self._tree_iters[item.raw.ID] = tree_iter
+       item_id])
+    self._tree_iters[item_id] = tree_iter
     
     return tree_iter
   
   def _update_item(self, item):
+    tree_iter = self._tree_iters[item.raw.ID]
+    
+    new_values = (bool(item.tags), True, pg.utils.safe_encode_gtk(item.name))
+    current_values = self._tree_model.get(
+      tree_iter,
+      self._COLUMN_ICON_TAG_VISIBLE,
+      self._COLUMN_ITEM_NAME_SENSITIVE,
+      self._COLUMN_ITEM_NAME)
+    
+    # Avoid emitting the `'row-changed'` signal if no value would be modified.
+    if current_values == new_values:
+      return
+    
     self._tree_model.set(
-      self._tree_iters[item.raw.ID],
-      self._COLUMN_ICON_TAG_VISIBLE[0],
-      bool(item.tags),
-      self._COLUMN_ITEM_NAME_SENSITIVE[0],
-      True,
-      self._COLUMN_ITEM_NAME[0],
-      pg.utils.safe_encode_gtk(item.name))
+      tree_iter,
+      self._COLUMN_ICON_TAG_VISIBLE,
+      new_values[0],
+      self._COLUMN_ITEM_NAME_SENSITIVE,
+      new_values[1],
+      self._COLUMN_ITEM_NAME,
+      new_values[2])
   
   def _insert_parent_items(self, item):
+    # Parents are always inserted before their children. If the immediate
+    # parent is inserted, all other parents are as well.
+    if item.parent is None or item.parent.raw.ID in self._tree_iters:
+      return
+    
+    tree_iters = self._tree_iters
+    
     for parent_elem in item.parents:
-      if not self._tree_iters[parent_elem.raw.ID]:
+      if tree_iters.get(parent_elem.raw.ID) is None:
         self._insert_item(parent_elem)
   
-  def _update_parent_items(self, item):
+  def _update_parent_items(self, item, updated_parent_item_ids):
+    # Same as in `_insert_parent_items()`, if the immediate parent is updated,
+    # all other parents are as well.
+    if item.parent is None or item.parent.raw.ID in updated_parent_item_ids:
+      return
+    
     for parent_elem in item.parents:
-      self._update_item(parent_elem)
+      parent_item_id = parent_elem.raw.ID
+      if parent_item_id not in updated_parent_item_ids:
+        self._update_item(parent_elem)
+        updated_parent_item_ids.add(parent_item_id)
   
   def _enable_filtered_items(self, enabled):
     if self.is_filtering:
       if not enabled:
         self._is_item_in_selected_items_rule = self._exporter.item_tree.filter.add(
           builtin_constraints.is_item_in_selected_items,
-          [self._selected_items])
+          [self._selected_items_set])
         
         for rule in self._selected_items_filter_rules:
           self._exporter.item_tree.filter.add(
@@ -594,44 +687,72 @@ class ExportNamePreview(preview_base_.ExportPreview):
   
   def _set_item_tree_sensitive_for_selected(self):
     if self.is_filtering:
-      self._set_items_sensitive(self._exporter.item_tree, False)
-      self._set_items_sensitive(
-        [self._exporter.item_tree[item_id] for item_id in self._selected_items],
-        True)
+      for item_id, sensitive in self._get_items_sensitive_for_selected().items():
+        self._set_item_sensitive(item_id, sensitive)
+  
+  def _get_items_sensitive_for_selected(self):
+    """
+    Return a dictionary of (item ID, sensitive) pairs for items in the item tree,
+    selected items and their parents.
+    
+    Items are sensitive only if selected. Parents are sensitive if selected or
+    if at least one of their children is sensitive.
+    """
+    items_sensitive = {}
+    parent_items = {}
+    selected_item_ids = self._selected_items_set
+    tree_iters = self._tree_iters
+    
+    for item in self._exporter.item_tree:
+      items_sensitive[item.raw.ID] = False
+      parent_items.update((parent_elem.raw.ID, parent_elem) for parent_elem in item.parents)
+    
+    for item_id in selected_item_ids:
+      items_sensitive[item_id] = True
+      parent_items.update(
+        (parent_elem.raw.ID, parent_elem)
+        for parent_elem in self._exporter.item_tree[item_id].parents)
+    
+    # Process the most nested parents first so that the sensitivity of each
+    # parent is computed only once from its already computed children.
+    for parent_elem in sorted(
+          parent_items.values(), key=lambda item: item.depth, reverse=True):
+      items_sensitive[parent_elem.raw.ID] = (
+        parent_elem.raw.ID in selected_item_ids
+        or any(
+          items_sensitive[child_elem.raw.ID] if child_elem.raw.ID in items_sensitive
+          else self._get_item_sensitive(child_elem)
+          for child_elem in parent_elem.children
+          if child_elem.raw.ID in tree_iters))
+    
+    return items_sensitive
   
   def _get_item_sensitive(self, item):
     return self._tree_model.get_value(
-      self._tree_iters[item.raw.ID], self._COLUMN_ITEM_NAME_SENSITIVE[0])
+      self._tree_iters[item.raw.ID], self._COLUMN_ITEM_NAME_SENSITIVE)
   
-  def _set_item_sensitive(self, item, sensitive):
-    if self._tree_iters[item.raw.ID] is not None:
+  def _set_item_sensitive(self, item_id, sensitive):
+    tree_iter = self._tree_iters.get(item_id)
+    if (tree_iter is not None
+        and self._tree_model.get_value(
+          tree_iter, self._COLUMN_ITEM_NAME_SENSITIVE) != sensitive):
       self._tree_model.set_value(
-        self._tree_iters[item.raw.ID],
-        self._COLUMN_ITEM_NAME_SENSITIVE[0],
+        tree_iter,
+        self._COLUMN_ITEM_NAME_SENSITIVE,
         sensitive)
   
-  def _set_parent_items_sensitive(self, item):
-    for parent_elem in reversed(list(item.parents)):
-      parent_sensitive = any(
-        self._get_item_sensitive(child_elem) for child_elem in parent_elem.children
-        if child_elem.raw.ID in self._tree_iters)
-      self._set_item_sensitive(parent_elem, parent_sensitive)
-  
-  def _set_items_sensitive(self, items, sensitive):
-    for item in items:
-      self._set_item_sensitive(item, sensitive)
-      self._set_parent_items_sensitive(item)
-  
   def _get_icon_from_item(self, item):
-    if item.item_type == item.ITEM:
+    item_type = item.item_type
+    
+    if item_type == item.ITEM:
       return self._icons['item']
-    elif item.item_type == item.NONEMPTY_GROUP:
+    elif item_type == item.EMPTY_GROUP:
+      return self._icons['item_group']
+    elif item_type == item.NONEMPTY_GROUP:
       if not self._exporter.has_exported_item(item.raw):
         return self._icons['item_group']
       else:
         return self._icons['exported_item_group']
-    elif item.item_type == item.EMPTY_GROUP:
-      return self._icons['item_group']
     else:
       return None
   
@@ -642,53 +763,63 @@ class ExportNamePreview(preview_base_.ExportPreview):
     If `tree_path` is specified, set the states only for the child elements in
     the tree path, otherwise set the states in the whole tree view.
     """
-    self._row_expand_collapse_interactive = False
-    
-    if tree_path is None:
-      self._tree_view.expand_all()
-    else:
-      self._tree_view.expand_row(tree_path, True)
-    
-    self._remove_no_longer_valid_collapsed_items()
-    
-    for item_id in self._collapsed_items:
-      if item_id in self._tree_iters:
-        item_tree_iter = self._tree_iters[item_id]
-        if item_tree_iter is None:
-          continue
-        
-        item_tree_path = self._tree_model.get_path(item_tree_iter)
-        if tree_path is None or self._tree_view.row_expanded(item_tree_path):
-          self._tree_view.collapse_row(item_tree_path)
-    
-    self._row_expand_collapse_interactive = True
+    # Block the handlers rather than only ignoring the signals in the handlers
+    # as the signals are emitted for each expanded or collapsed row.
+    self._tree_view.handler_block_by_func(self._on_tree_view_row_collapsed)
+    self._tree_view.handler_block_by_func(self._on_tree_view_row_expanded)
+    
+    try:
+      if tree_path is None:
+        self._tree_view.expand_all()
+      else:
+        self._tree_view.expand_row(tree_path, True)
+      
+      self._remove_no_longer_valid_collapsed_items()
+      
+      for item_id in self._collapsed_items:
+        if item_id in self._tree_iters:
+          item_tree_path = self._tree_model.get_path(self._tree_iters[item_id])
+          if tree_path is None or self._tree_view.row_expanded(item_tree_path):
+            self._tree_view.collapse_row(item_tree_path)
+    finally:
+      self._tree_view.handler_unblock_by_func(self._on_tree_view_row_collapsed)
+      self._tree_view.handler_unblock_by_func(self._on_tree_view_row_expanded)
   
   def _remove_no_longer_valid_collapsed_items(self):
     if self._exporter.item_tree is None:
       return
     
-    self._exporter.item_tree.is_filtered = False
+    # Membership tests in the item tree ignore filters, hence there is no need
+    # to temporarily disable filtering.
     self._collapsed_items = set(
       [collapsed_item for collapsed_item in self._collapsed_items
        if collapsed_item in self._exporter.item_tree])
-    self._exporter.item_tree.is_filtered = True
   
   def _set_selection(self):
-    self._row_select_interactive = False
+    tree_selection = self._tree_view.get_selection()
     
-    self._selected_items = [
-      item for item in self._selected_items if item in self._tree_iters]
+    # Block the handler rather than only ignoring the `'changed'` signal in
+    # the handler as the signal is emitted for each selected row.
+    tree_selection.handler_block_by_func(self._on_tree_selection_changed)
     
-    for item in self._selected_items:
-      tree_iter = self._tree_iters[item]
-      if tree_iter is not None:
-        self._tree_view.get_selection().select_iter(tree_iter)
-    
-    if self._initial_scroll_to_selection and self._selected_items:
-      self._set_initial_scroll_to_selection()
-      self._initial_scroll_to_selection = False
-    
-    self._row_select_interactive = True
+    try:
+      self._selected_items = [
+        item for item in self._selected_items if item in self._tree_iters]
+      self._update_selected_items_set()
+      
+      for item in self._selected_items:
+        tree_selection.select_iter(self._tree_iters[item])
+      
+      if self._initial_scroll_to_selection and self._selected_items:
+        self._set_initial_scroll_to_selection()
+        self._initial_scroll_to_selection = False
+    finally:
+      tree_selection.handler_unblock_by_func(self._on_tree_selection_changed)
+  
+  def _update_selected_items_set(self):
+    # The set is modified in place as it may be referenced by filter rules.
+    self._selected_items_set.clear()
+    self._selected_items_set.update(self._selected_items)
   
   def _set_cursor(self, previous_cursor=None):
     self._row_select_interactive = False
@@ -701,12 +832,27 @@ class ExportNamePreview(preview_base_.ExportPreview):
   
   def _set_initial_scroll_to_selection(self):
     if self._selected_items:
-      tree_iter = self._tree_iters[self._selected_items[0]]
+      tree_iter = self._tree_iters.get(self._selected_items[0])
       if tree_iter is not None:
-        first_selected_item_path = (
-          self._tree_model.get_path(self._tree_iters[self._selected_items[0]]))
+        first_selected_item_path = self._tree_model.get_path(tree_iter)
         if first_selected_item_path is not None:
           self._tree_view.scroll_to_cell(first_selected_item_path, None, True, 0.5, 0.0)
 
 
+def _get_tag_sort_key(tag):
+  return tag.lower()
+
+
+def _insert_sort_key(sort_keys, tag):
+  """
+  Insert the sort key of `tag` to the sorted list `sort_keys` and return the
+  position of the inserted key.
+  """
+  sort_key = _get_tag_sort_key(tag)
+  position = bisect.bisect_left(sort_keys, sort_key)
+  sort_keys.insert(position, sort_key)
+  
+  return position
+
+
 gobject.type_register(ExportNamePreview)
@@ -15,6 +15,17 @@ class ExportPreviewsController(object):
   
   _DELAY_PREVIEWS_SETTING_UPDATE_MILLISECONDS = 50
   _DELAY_PREVIEWS_PANE_DRAG_UPDATE_MILLISECONDS = 500
+  _DELAY_PREVIEWS_PANE_DRAG_RESIZE_MILLISECONDS = 50
+  _DELAY_PREVIEWS_SELECTION_UPDATE_MILLISECONDS = 50
+  
+  _TAG_DEPENDENT_BUILTIN_ACTIONS = frozenset([
+    'autocrop_background',
+    'autocrop_foreground',
+    'insert_background_layers',
+    'insert_foreground_layers',
+    'only_layers_with_tags',
+    'only_layers_without_tags',
+  ])
   
   def __init__(self, name_preview, image_preview, settings, image):
     self._name_preview = name_preview
@@ -22,10 +33,16 @@ class ExportPreviewsController(object):
     self._settings = settings
     self._image = image
     
-    self._only_selected_items_constraints = {}
-    self._custom_actions = {}
+    self._enabled_only_selected_items_constraints = set()
+    self._enabled_custom_actions = set()
+    self._enabled_tag_dependent_actions = set()
     self._is_initial_selection_set = False
     
+    # Settings accessed in frequently invoked event handlers
+    self._name_preview_sensitive_setting = self._settings['gui/name_preview_sensitive']
+    self._image_preview_sensitive_setting = self._settings['gui/image_preview_sensitive']
+    self._selected_items_setting = self._settings['main/selected_layers']
+    
     self._paned_outside_previews_previous_position = (
       self._settings['gui/paned_outside_previews_position'].value)
     self._paned_between_previews_previous_position = (
@@ -41,6 +58,7 @@ class ExportPreviewsController(object):
     
     self._connect_toggle_name_preview_filtering()
     self._connect_set_image_preview_scaling()
+    self._connect_track_tag_dependent_actions()
     self._connect_image_preview_menu_setting_changes()
     
     self._connect_toplevel_notify_is_active()
@@ -61,30 +79,26 @@ class ExportPreviewsController(object):
         and self._paned_outside_previews_previous_position != max_position):
       self._disable_preview_on_paned_drag(
         self._name_preview,
-        self._settings['gui/name_preview_sensitive'],
+        self._name_preview_sensitive_setting,
         'previews_sensitive')
       self._disable_preview_on_paned_drag(
         self._image_preview,
-        self._settings['gui/image_preview_sensitive'],
+        self._image_preview_sensitive_setting,
         'previews_sensitive')
     elif (current_position != max_position
           and self._paned_outside_previews_previous_position == max_position):
       self._enable_preview_on_paned_drag(
         self._name_preview,
-        self._settings['gui/name_preview_sensitive'],
+        self._name_preview_sensitive_setting,
         'previews_sensitive')
       self._enable_preview_on_paned_drag(
         self._image_preview,
-        self._settings['gui/image_preview_sensitive'],
+        self._image_preview_sensitive_setting,
         'previews_sensitive')
     elif current_position != self._paned_outside_previews_previous_position:
-      if self._image_preview.is_larger_than_image():
-        pg.invocation.timeout_add_strict(
-          self._DELAY_PREVIEWS_PANE_DRAG_UPDATE_MILLISECONDS,
-          self._image_preview.update)
-      else:
-        pg.invocation.timeout_remove_strict(self._image_preview.update)
-        self._image_preview.resize()
+      pg.invocation.timeout_add_strict(
+        self._DELAY_PREVIEWS_PANE_DRAG_RESIZE_MILLISECONDS,
+        self._resize_image_preview_on_paned_drag)
     
     self._paned_outside_previews_previous_position = current_position
   
@@ -97,37 +111,42 @@ class ExportPreviewsController(object):
         and self._paned_between_previews_previous_position != max_position):
       self._disable_preview_on_paned_drag(
         self._image_preview,
-        self._settings['gui/image_preview_sensitive'],
+        self._image_preview_sensitive_setting,
         'vpaned_preview_sensitive')
     elif (current_position != max_position
           and self._paned_between_previews_previous_position == max_position):
       self._enable_preview_on_paned_drag(
         self._image_preview,
-        self._settings['gui/image_preview_sensitive'],
+        self._image_preview_sensitive_setting,
         'vpaned_preview_sensitive')
     elif (current_position == min_position
           and self._paned_between_previews_previous_position != min_position):
       self._disable_preview_on_paned_drag(
         self._name_preview,
-        self._settings['gui/name_preview_sensitive'],
+        self._name_preview_sensitive_setting,
         'vpaned_preview_sensitive')
     elif (current_position != min_position
           and self._paned_between_previews_previous_position == min_position):
       self._enable_preview_on_paned_drag(
         self._name_preview,
-        self._settings['gui/name_preview_sensitive'],
+        self._name_preview_sensitive_setting,
         'vpaned_preview_sensitive')
     elif current_position != self._paned_between_previews_previous_position:
-      if self._image_preview.is_larger_than_image():
-        pg.invocation.timeout_add_strict(
-          self._DELAY_PREVIEWS_PANE_DRAG_UPDATE_MILLISECONDS,
-          self._image_preview.update)
-      else:
-        pg.invocation.timeout_remove_strict(self._image_preview.update)
-        self._image_preview.resize()
+      pg.invocation.timeout_add_strict(
+        self._DELAY_PREVIEWS_PANE_DRAG_RESIZE_MILLISECONDS,
+        self._resize_image_preview_on_paned_drag)
     
     self._paned_between_previews_previous_position = current_position
   
+  def _resize_image_preview_on_paned_drag(self):
+    if self._image_preview.is_larger_than_image():
+      pg.invocation.timeout_add_strict(
+        self._DELAY_PREVIEWS_PANE_DRAG_UPDATE_MILLISECONDS,
+        self._image_preview.update)
+    else:
+      pg.invocation.timeout_remove_strict(self._image_preview.update)
+      self._image_preview.resize()
+  
   def _connect_actions_changed(self, actions_):
     def _on_after_add_action(actions_, action, *args, **kwargs):
       if action['enabled'].value:
@@ -158,43 +177,46 @@ class ExportPreviewsController(object):
   def _connect_setting_after_reset_collapsed_items_in_name_preview(self):
     self._settings[
       'gui_session/name_preview_layers_collapsed_state'].connect_event(
-        'after-reset',
-        lambda setting: self._name_preview.set_collapsed_items(
-          setting.value[self._image.ID]))
+        'after-reset', self._on_after_reset_collapsed_items)
   
   def _connect_setting_after_reset_selected_items_in_name_preview(self):
-    self._settings['main/selected_layers'].connect_event(
-      'after-reset',
-      lambda setting: self._name_preview.set_selected_items(
-        setting.value[self._image.ID]))
+    self._selected_items_setting.connect_event(
+      'after-reset', self._on_after_reset_selected_items)
   
   def _connect_setting_after_reset_displayed_items_in_image_preview(self):
-    def _clear_image_preview(setting):
-      self._image_preview.clear()
-    
     self._settings['gui_session/image_preview_displayed_layers'].connect_event(
-      'after-reset', _clear_image_preview)
+      'after-reset', self._on_after_reset_displayed_items)
+  
+  def _on_after_reset_collapsed_items(self, setting):
+    self._name_preview.set_collapsed_items(setting.value[self._image.ID])
+  
+  def _on_after_reset_selected_items(self, setting):
+    self._name_preview.set_selected_items(setting.value[self._image.ID])
+  
+  def _on_after_reset_displayed_items(self, setting):
+    self._image_preview.clear()
   
   def _connect_toggle_name_preview_filtering(self):
     def _after_add_only_selected_items(constraints, constraint, orig_constraint_dict):
       if constraint['orig_name'].value == 'only_selected_layers':
-        self._only_selected_items_constraints[constraint.name] = constraint
-        
-        _on_enabled_changed(constraint['enabled'])
-        constraint['enabled'].connect_event('value-changed', _on_enabled_changed)
+        _on_enabled_changed(constraint['enabled'], constraint)
+        constraint['enabled'].connect_event(
+          'value-changed', _on_enabled_changed, constraint)
     
     def _before_remove_only_selected_items(constraints, constraint):
-      if constraint.name in self._only_selected_items_constraints:
-        del self._only_selected_items_constraints[constraint.name]
+      self._enabled_only_selected_items_constraints.discard(constraint)
     
     def _before_clear_constraints(constraints):
-      self._only_selected_items_constraints = {}
+      self._enabled_only_selected_items_constraints.clear()
       self._name_preview.is_filtering = False
     
-    def _on_enabled_changed(constraint_enabled):
-      self._name_preview.is_filtering = (
-        any(constraint['enabled'].value
-            for constraint in self._only_selected_items_constraints.values()))
+    def _on_enabled_changed(constraint_enabled, constraint):
+      if constraint_enabled.value:
+        self._enabled_only_selected_items_constraints.add(constraint)
+      else:
+        self._enabled_only_selected_items_constraints.discard(constraint)
+      
+      self._name_preview.is_filtering = bool(self._enabled_only_selected_items_constraints)
     
     self._settings['main/constraints'].connect_event(
       'after-add-action', _after_add_only_selected_items)
@@ -208,46 +230,63 @@ class ExportPreviewsController(object):
   def _connect_set_image_preview_scaling(self):
     def _after_add_action(actions, action, orig_action_dict, builtin_actions):
       if action['orig_name'].value not in builtin_actions:
-        self._custom_actions[action.name] = action
-        
-        _set_image_preview_scaling(action['enabled'])
-        action['enabled'].connect_event('value-changed', _set_image_preview_scaling)
+        _on_enabled_changed(action['enabled'], action)
+        action['enabled'].connect_event('value-changed', _on_enabled_changed, action)
     
     def _before_remove_action(actions, action):
-      if action.name in self._custom_actions:
-        del self._custom_actions[action.name]
+      self._enabled_custom_actions.discard(action)
     
     def _before_clear_actions(actions):
-      self._custom_actions = {}
-      self._image_preview.set_scaling()
+      self._enabled_custom_actions.difference_update(actions['added'])
+      _set_image_preview_scaling()
     
-    def _set_image_preview_scaling(action_enabled):
-      if not any(action['enabled'].value for action in self._custom_actions.values()):
+    def _on_enabled_changed(action_enabled, action):
+      if action_enabled.value:
+        self._enabled_custom_actions.add(action)
+      else:
+        self._enabled_custom_actions.discard(action)
+      
+      _set_image_preview_scaling()
+    
+    def _set_image_preview_scaling():
+      if not self._enabled_custom_actions:
         self._image_preview.set_scaling()
       else:
         self._image_preview.set_scaling(['after_process_item'], ['after_process_item'])
     
-    self._settings['main/procedures'].connect_event(
-      'after-add-action',
-      _after_add_action,
-      builtin_procedures.BUILTIN_PROCEDURES)
-    
-    self._settings['main/procedures'].connect_event(
-      'before-remove-action', _before_remove_action)
+    for actions_, builtin_actions in [
+          (self._settings['main/procedures'], builtin_procedures.BUILTIN_PROCEDURES),
+          (self._settings['main/constraints'], builtin_constraints.BUILTIN_CONSTRAINTS)]:
+      actions_.connect_event('after-add-action', _after_add_action, builtin_actions)
+      actions_.connect_event('before-remove-action', _before_remove_action)
+      actions_.connect_event('before-clear-actions', _before_clear_actions)
+  
+  def _connect_track_tag_dependent_actions(self):
+    def _after_add_action(actions, action, orig_action_dict, builtin_actions):
+      # Custom actions may use tags in any way, hence they are also tracked.
+      if (action['orig_name'].value in self._TAG_DEPENDENT_BUILTIN_ACTIONS
+          or action['orig_name'].value not in builtin_actions):
+        _on_enabled_changed(action['enabled'], action)
+        action['enabled'].connect_event('value-changed', _on_enabled_changed, action)
     
-    self._settings['main/procedures'].connect_event(
-      'before-clear-actions', _before_clear_actions)
+    def _before_remove_action(actions, action):
+      self._enabled_tag_dependent_actions.discard(action)
     
-    self._settings['main/constraints'].connect_event(
-      'after-add-action',
-      _after_add_action,
-      builtin_constraints.BUILTIN_CONSTRAINTS)
+    def _before_clear_actions(actions):
+      self._enabled_tag_dependent_actions.difference_update(actions['added'])
     
-    self._settings['main/constraints'].connect_event(
-      'before-remove-action', _before_remove_action)
+    def _on_enabled_changed(action_enabled, action):
+      if action_enabled.value:
+        self._enabled_tag_dependent_actions.add(action)
+      else:
+        self._enabled_tag_dependent_actions.discard(action)
     
-    self._settings['main/constraints'].connect_event(
-      'before-clear-actions', _before_clear_actions)
+    for actions_, builtin_actions in [
+          (self._settings['main/procedures'], builtin_procedures.BUILTIN_PROCEDURES),
+          (self._settings['main/constraints'], builtin_constraints.BUILTIN_CONSTRAINTS)]:
+      actions_.connect_event('after-add-action', _after_add_action, builtin_actions)
+      actions_.connect_event('before-remove-action', _before_remove_action)
+      actions_.connect_event('before-clear-actions', _before_clear_actions)
   
   def _connect_image_preview_menu_setting_changes(self):
     self._settings['gui/image_preview_automatic_update'].connect_event(
@@ -264,13 +303,18 @@ class ExportPreviewsController(object):
    
   def _on_name_preview_selection_changed(self, preview):
     self._update_selected_items()
-    self._update_image_preview()
+    # Changing the selection rapidly (e.g. by holding an arrow key) would
+    # otherwise render the image preview for each selected item.
+    pg.invocation.timeout_add_strict(
+      self._DELAY_PREVIEWS_SELECTION_UPDATE_MILLISECONDS, self._update_image_preview)
   
   def _on_name_preview_updated(self, preview):
     self._image_preview.update_item()
   
   def _on_name_preview_tags_changed(self, preview):
-    self._update_image_preview()
+    # The displayed item needs to be rendered again only if tags can affect its
+    # processing.
+    self._update_image_preview(force_update=bool(self._enabled_tag_dependent_actions))
   
   def _on_toplevel_notify_is_active(self, toplevel, property_spec):
     if toplevel.is_active():
@@ -317,21 +361,37 @@ class ExportPreviewsController(object):
     self._is_initial_selection_set = True
   
   def _update_selected_items(self):
-    selected_items_dict = self._settings['main/selected_layers'].value
-    selected_items_dict[self._image.ID] = self._name_preview.selected_items
-    self._settings['main/selected_layers'].set_value(selected_items_dict)
+    selected_items_dict = self._selected_items_setting.value
+    selected_items = self._name_preview.selected_items
+    
+    # Avoid invoking 'value-changed' handlers if the selection is the same.
+    if selected_items_dict.get(self._image.ID) == selected_items:
+      return
+    
+    selected_items_dict[self._image.ID] = selected_items
+    self._selected_items_setting.set_value(selected_items_dict)
   
-  def _update_image_preview(self):
-    item_from_cursor = self._name_preview.get_item_from_cursor()
-    if item_from_cursor is not None:
-      if (self._image_preview.item is None
-          or item_from_cursor.raw.ID != self._image_preview.item.raw.ID):
-        self._image_preview.item = item_from_cursor
-        self._image_preview.update()
-    else:
+  def _update_image_preview(self, force_update=False):
+    """
+    Display the item under the cursor in the name preview, or the first
+    selected item if there is no cursor.
+    
+    The image preview is not updated if the item is already displayed, unless
+    `force_update` is `True`.
+    """
+    item = self._name_preview.get_item_from_cursor()
+    if item is None:
       items_from_selected_rows = self._name_preview.get_items_from_selected_rows()
       if items_from_selected_rows:
-        self._image_preview.item = items_from_selected_rows[0]
-        self._image_preview.update()
+        item = items_from_selected_rows[0]
       else:
         self._image_preview.clear()
+        return
+    
+    if (not force_update
+        and self._image_preview.item is not None
+        and item.raw.ID == self._image_preview.item.raw.ID):
+      return
+    
+    self._image_preview.item = item
+    self._image_preview.update()
@@ -9,8 +9,6 @@ The class allows loading/saving using setting sources defined in the
 from __future__ import absolute_import, division, print_function, unicode_literals
 from future.builtins import *
 
-import collections
-
 from . import _sources_errors
 
 __all__ = [
@@ -81,7 +79,9 @@ class Persistor(object):
     for setting in all_settings:
       setting.invoke_event('before-load')
     
-    for source in setting_sources:
+    last_source_index = len(setting_sources) - 1
+    
+    for source_index, source in enumerate(setting_sources):
       try:
         source.read(settings)
       except (_sources_errors.SettingsNotFoundInSourceError,
@@ -89,7 +89,7 @@ class Persistor(object):
         if isinstance(e, _sources_errors.SettingsNotFoundInSourceError):
           settings = e.settings_not_found
         
-        if source == setting_sources[-1]:
+        if source_index == last_source_index:
           all_settings_found = False
           not_all_settings_found_message = str(e)
           break
@@ -173,9 +173,9 @@ class Persistor(object):
     # only once per each source.
     settings = []
     for setting_or_group in settings_or_groups:
-      if isinstance(setting_or_group, collections.Iterable):
+      if hasattr(setting_or_group, 'walk'):
         group = setting_or_group
-        settings.extend(list(group.walk()))
+        settings.extend(group.walk())
       else:
         setting = setting_or_group
         settings.append(setting)
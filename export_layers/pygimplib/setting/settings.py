@@ -1886,6 +1886,13 @@ class ArraySetting(Setting):
     for key, value in self._element_kwargs.items():
       pgutils.create_read_only_property(self, 'element_' + key, value)
     
+    self._element_creation_kwargs = dict(
+      dict(
+        name='element',
+        display_name='',
+        pdb_type=None),
+      **self._element_kwargs)
+    
     self._elements = []
     
     array_kwargs = {
@@ -2110,14 +2117,7 @@ class ArraySetting(Setting):
     return self._element_type(name='element', **dict(self._element_kwargs, gui_type=None))
   
   def _create_element(self, value):
-    kwargs = dict(
-      dict(
-        name='element',
-        display_name='',
-        pdb_type=None),
-      **self._element_kwargs)
-    
-    setting = self._element_type(**kwargs)
+    setting = self._element_type(**self._element_creation_kwargs)
     setting.set_value(value)
     
     return setting
@@ -25,6 +25,24 @@ from .. import stubs_gimp
 from . import stubs_setting
 
 
+_LOAD_SAVE_TEST_CASES = [
+  ('default_source',
+   ['default'], None, True, ['default']),
+  
+  ('no_default_source',
+   None, None, True, []),
+  
+  ('parameter_not_in_empty_default_sources',
+   None, ['param'], True, []),
+  
+  ('parameter_not_in_default_sources',
+   ['default'], ['param'], True, []),
+  
+  ('parameter_matching_a_default_source',
+   ['one', 'two'], ['one'], True, ['one']),
+]
+
+
 class TestSetting(unittest.TestCase):
   
   def setUp(self):
@@ -142,22 +160,7 @@ class TestSetting(unittest.TestCase):
     setting.reset()
     self.assertEqual(setting.value, {})
   
-  @parameterized.parameterized.expand([
-    ('default_source',
-     ['default'], None, True, ['default']),
-    
-    ('no_default_source',
-     None, None, True, []),
-    
-    ('parameter_not_in_empty_default_sources',
-     None, ['param'], True, []),
-    
-    ('parameter_not_in_default_sources',
-     ['default'], ['param'], True, []),
-    
-    ('parameter_matching_a_default_source',
-     ['one', 'two'], ['one'], True, ['one']),
-  ])
+  @parameterized.parameterized.expand(_LOAD_SAVE_TEST_CASES)
   @mock.patch(pgutils.get_pygimplib_module_path() + '.setting.persistor.Persistor.load')
   def test_load(
         self,
@@ -175,22 +178,7 @@ class TestSetting(unittest.TestCase):
       mock_persistor_load,
       'load')
   
-  @parameterized.parameterized.expand([
-    ('default_source',
-     ['default'], None, True, ['default']),
-    
-    ('no_default_source',
-     None, None, True, []),
-    
-    ('parameter_not_in_empty_default_sources',
-     None, ['param'], True, []),
-    
-    ('parameter_not_in_default_sources',
-     ['default'], ['param'], True, []),
-    
-    ('parameter_matching_a_default_source',
-     ['one', 'two'], ['one'], True, ['one']),
-  ])
+  @parameterized.parameterized.expand(_LOAD_SAVE_TEST_CASES)
   @mock.patch(pgutils.get_pygimplib_module_path() + '.setting.persistor.Persistor.save')
   def test_save(
         self,
@@ -226,14 +214,14 @@ class TestSetting(unittest.TestCase):
       self.assertFalse(mock_load_save.called)
     
     sources = (
-      sources_for_setting if sources_for_setting is not None else []
-      + sources_as_parameters if sources_as_parameters is not None else [])
+      (sources_for_setting if sources_for_setting is not None else [])
+      + (sources_as_parameters if sources_as_parameters is not None else []))
+    
+    call_args = (
+      mock_load_save.call_args[0][1]
+      if mock_load_save.call_args[0][1] is not None else [])
     
     for source in sources:
-      call_args = (
-        mock_load_save.call_args[0][1]
-        if mock_load_save.call_args[0][1] is not None else [])
-      
       if source in sources_in_call_args:
         self.assertIn(source, call_args)
       else:
@@ -426,19 +414,20 @@ class TestSettingGui(unittest.TestCase):
     self.assertFalse(self.setting.gui.get_visible())
     self.assertEqual(self.widget.value, 'gif')
   
-  def test_setting_gui_type(self):
-    setting = stubs_setting.SettingWithGuiStub(
-      'only_visible_layers', False, gui_type=stubs_setting.CheckButtonPresenterStub)
-    setting.set_gui()
-    self.assertIs(type(setting.gui), stubs_setting.CheckButtonPresenterStub)
-    self.assertIs(type(setting.gui.element), stubs_setting.CheckButtonStub)
-  
-  def test_setting_different_gui_type(self):
+  @parameterized.parameterized.expand([
+    ('check_button_presenter',
+     stubs_setting.CheckButtonPresenterStub, stubs_setting.CheckButtonStub),
+    
+    ('presenter',
+     stubs_setting.PresenterStub, stubs_setting.GuiWidgetStub),
+  ])
+  def test_setting_gui_type(
+        self, test_case_name_suffix, gui_type, expected_gui_element_type):
     setting = stubs_setting.SettingWithGuiStub(
-      'only_visible_layers', False, gui_type=stubs_setting.PresenterStub)
+      'only_visible_layers', False, gui_type=gui_type)
     setting.set_gui()
-    self.assertIs(type(setting.gui), stubs_setting.PresenterStub)
-    self.assertIs(type(setting.gui.element), stubs_setting.GuiWidgetStub)
+    self.assertIs(type(setting.gui), gui_type)
+    self.assertIs(type(setting.gui.element), expected_gui_element_type)
   
   def test_setting_invalid_gui_type_raise_error(self):
     with self.assertRaises(ValueError):
@@ -599,23 +588,21 @@ class TestIntSetting(unittest.TestCase):
     self.setting = settings_.IntSetting(
       'count', default_value=0, min_value=0, max_value=100)
   
-  def test_value_is_below_min(self):
-    with self.assertRaises(settings_.SettingValueError):
-      self.setting.set_value(-5)
-  
-  def test_min_value_does_not_raise_error(self):
-    try:
-      self.setting.set_value(0)
-    except settings_.SettingValueError:
-      self.fail('SettingValueError should not be raised')
-  
-  def test_value_is_above_max(self):
+  @parameterized.parameterized.expand([
+    ('below_min', -5),
+    ('above_max', 200),
+  ])
+  def test_value_out_of_range_raises_error(self, test_case_name_suffix, value):
     with self.assertRaises(settings_.SettingValueError):
-      self.setting.set_value(200)
+      self.setting.set_value(value)
   
-  def test_max_value_does_not_raise_error(self):
+  @parameterized.parameterized.expand([
+    ('min', 0),
+    ('max', 100),
+  ])
+  def test_boundary_value_does_not_raise_error(self, test_case_name_suffix, value):
     try:
-      self.setting.set_value(100)
+      self.setting.set_value(value)
     except settings_.SettingValueError:
       self.fail('SettingValueError should not be raised')
 
@@ -626,23 +613,21 @@ class TestFloatSetting(unittest.TestCase):
     self.setting = settings_.FloatSetting(
       'clip_percent', default_value=0.0, min_value=0.0, max_value=100.0)
   
-  def test_value_below_min(self):
-    with self.assertRaises(settings_.SettingValueError):
-      self.setting.set_value(-5.0)
-  
-  def test_minimum_value_does_not_raise_error(self):
-    try:
-      self.setting.set_value(0.0)
-    except settings_.SettingValueError:
-      self.fail('SettingValueError should not be raised')
-  
-  def test_value_above_max(self):
+  @parameterized.parameterized.expand([
+    ('below_min', -5.0),
+    ('above_max', 200.0),
+  ])
+  def test_value_out_of_range_raises_error(self, test_case_name_suffix, value):
     with self.assertRaises(settings_.SettingValueError):
-      self.setting.set_value(200.0)
+      self.setting.set_value(value)
   
-  def test_maximum_value_does_not_raise_error(self):
+  @parameterized.parameterized.expand([
+    ('min', 0.0),
+    ('max', 100.0),
+  ])
+  def test_boundary_value_does_not_raise_error(self, test_case_name_suffix, value):
     try:
-      self.setting.set_value(100.0)
+      self.setting.set_value(value)
     except settings_.SettingValueError:
       self.fail('SettingValueError should not be raised')
 
@@ -654,10 +639,6 @@ class TestCreateEnumSetting(unittest.TestCase):
       'overwrite_mode', [('skip', 'Skip'), ('replace', 'Replace')])
     self.assertEqual(setting.default_value, setting.items['skip'])
   
-  def test_no_items_raises_error(self):
-    with self.assertRaises(ValueError):
-      settings_.EnumSetting('overwrite_mode', [])
-  
   def test_explicit_item_values(self):
     setting = settings_.EnumSetting(
       'overwrite_mode',
@@ -666,15 +647,25 @@ class TestCreateEnumSetting(unittest.TestCase):
     self.assertEqual(setting.items['skip'], 5)
     self.assertEqual(setting.items['replace'], 6)
   
-  def test_inconsistent_number_of_elements_raises_error(self):
-    with self.assertRaises(ValueError):
-      settings_.EnumSetting(
-        'overwrite_mode', 'replace', [('skip', 'Skip', 4), ('replace', 'Replace')])
+  @parameterized.parameterized.expand([
+    ('no_items',
+     []),
+    
+    ('inconsistent_number_of_elements',
+     [('skip', 'Skip', 4), ('replace', 'Replace')]),
     
-  def test_same_explicit_item_value_multiple_times_raises_error(self):
+    ('same_explicit_item_value_multiple_times',
+     [('skip', 'Skip', 4), ('replace', 'Replace', 4)]),
+    
+    ('too_many_elements',
+     [('skip', 'Skip', 1, 1), ('replace', 'Replace', 1, 1)]),
+    
+    ('too_few_elements',
+     [('skip'), ('replace')]),
+  ])
+  def test_invalid_items_raise_error(self, test_case_name_suffix, items):
     with self.assertRaises(ValueError):
-      settings_.EnumSetting(
-        'overwrite_mode', [('skip', 'Skip', 4), ('replace', 'Replace', 4)])
+      settings_.EnumSetting('overwrite_mode', items)
   
   def test_invalid_default_value_raises_error(self):
     with self.assertRaises(settings_.SettingDefaultValueError):
@@ -683,15 +674,6 @@ class TestCreateEnumSetting(unittest.TestCase):
         [('skip', 'Skip'), ('replace', 'Replace')],
         default_value='invalid_default_value')
   
-  def test_too_many_elements_in_items_raises_error(self):
-    with self.assertRaises(ValueError):
-      settings_.EnumSetting(
-        'overwrite_mode', [('skip', 'Skip', 1, 1), ('replace', 'Replace', 1, 1)])
-  
-  def test_too_few_elements_in_items_raises_error(self):
-    with self.assertRaises(ValueError):
-      settings_.EnumSetting('overwrite_mode', [('skip'), ('replace')])
-  
   def test_no_empty_value(self):
     setting = settings_.EnumSetting(
       'overwrite_mode', [('skip', 'Skip'), ('replace', 'Replace')])
@@ -782,14 +764,14 @@ class TestEnumSetting(unittest.TestCase):
 class TestImageSetting(unittest.TestCase):
   
   @mock.patch(
-    pgutils.get_pygimplib_module_path() + '.setting.settings.pdb', new=stubs_gimp.PdbStub())
-  def test_set_invalid_image(self):
-    pdb = stubs_gimp.PdbStub()
-    image = pdb.gimp_image_new(2, 2, gimpenums.RGB)
+    pgutils.get_pygimplib_module_path() + '.setting.settings.pdb',
+    new_callable=stubs_gimp.PdbStub)
+  def test_set_invalid_image(self, mock_pdb):
+    image = mock_pdb.gimp_image_new(2, 2, gimpenums.RGB)
     
     setting = settings_.ImageSetting('image', image)
     
-    pdb.gimp_image_delete(image)
+    mock_pdb.gimp_image_delete(image)
     with self.assertRaises(settings_.SettingValueError):
       setting.set_value(image)
   
@@ -839,10 +821,10 @@ class TestFileExtensionSetting(unittest.TestCase):
   def test_custom_error_message(self):
     self.setting.error_messages[pgpath.FileValidatorErrorStatuses.IS_EMPTY] = (
       'my custom message')
-    try:
+    with self.assertRaises(settings_.SettingValueError) as cm:
       self.setting.set_value('')
-    except settings_.SettingValueError as e:
-      self.assertEqual(str(e), 'my custom message')
+    
+    self.assertEqual(str(cm.exception), 'my custom message')
 
 
 class TestDirpathSetting(unittest.TestCase):
@@ -209,8 +209,10 @@ def _sync_selected_items_and_only_selected_items_constraint(
   def _on_selected_items_changed(
         selected_items_setting, only_selected_items_constraint, image_setting):
     if image_setting.value is not None:
+      # Selected items may be stored as a list. Convert them to allow fast
+      # membership tests when filtering each item.
       only_selected_items_constraint['arguments/selected_layers'].set_value(
-        selected_items_setting.value[image_setting.value.ID])
+        frozenset(selected_items_setting.value[image_setting.value.ID]))
   
   _on_selected_items_changed(selected_items_setting, constraint, image_setting)
   
@@ -528,6 +528,23 @@ class TestWalkActions(unittest.TestCase):
     self.assertListEqual(
       list(actions.walk(self.actions)),
       [self.actions['added/' + path] for path in expected_setting_paths])
+  
+  def test_walk_added_after_removing_and_clearing(self):
+    for action_dict in self.test_procedures.values():
+      actions.add(self.actions, action_dict)
+    
+    self.assertEqual(len(list(actions.walk(self.actions, 'procedure'))), 3)
+    
+    actions.remove(self.actions, 'autocrop_background')
+    
+    self.assertListEqual(
+      list(actions.walk(self.actions, 'procedure')),
+      [self.actions['added/' + path]
+       for path in ['autocrop', 'autocrop_foreground']])
+    
+    actions.clear(self.actions)
+    
+    self.assertListEqual(list(actions.walk(self.actions, 'procedure')), [])
 
 
 @mock.patch(
@@ -278,7 +278,7 @@ def _refresh_actions(actions_list, actions_root, old_action_prefix, new_action_p
       actions_.remove(actions_root, action.name)
   
   for index, removed_action in removed_actions:
-    action_dict = builtin_procedures.BUILTIN_PROCEDURES[new_action_prefix]
+    action_dict = dict(builtin_procedures.BUILTIN_PROCEDURES[new_action_prefix])
     action_dict['enabled'] = removed_action['enabled'].value
     action = actions_.add(actions_root, action_dict)
     actions_.reorder(actions_root, action.name, index)
@@ -29,20 +29,26 @@ if current_module_dirpath not in sys.path:
 from export_layers import pygimplib as pg
 from future.builtins import *
 
+import cProfile
 import importlib
 import io
 import pkgutil
+import pstats
 import unittest
 
 import gimpenums
 
 
+_NUM_PROFILE_STATS_TO_PRINT = 50
+
+
 def run_tests(
       dirpath,
       test_module_name_prefix='test_',
       modules=None,
       ignored_modules=None,
-      output_stream='stderr'):
+      output_stream='stderr',
+      profile=False):
   """
   Run all modules containing tests located in the specified directory path.
   The names of the test modules start with the specified prefix.
@@ -57,25 +63,24 @@ def run_tests(
   
   `output_stream` is the name of the stream to print the output to - `'stdout'`,
   `'stderr'` or a file path. Defaults to `'stderr'`.
+  
+  If `profile` is `True`, profile importing and running the test modules and
+  print the statistics sorted by cumulative time to `output_stream`.
   """
   module_names = []
   
-  if not ignored_modules:
-    ignored_modules = []
+  ignored_modules = tuple(ignored_modules) if ignored_modules else ()
+  
+  is_ignored = lambda module_name: module_name.startswith(ignored_modules)
   
   if not modules:
-    should_append = (
-      lambda module_name: (
-        not any(
-          module_name.startswith(ignored_module) for ignored_module in ignored_modules)))
+    should_append = lambda module_name: not is_ignored(module_name)
   else:
+    modules = tuple(modules)
     should_append = (
-      lambda module_name: (
-        any(module_name.startswith(module) for module in modules)
-        and not any(
-          module_name.startswith(ignored_module) for ignored_module in ignored_modules)))
+      lambda module_name: module_name.startswith(modules) and not is_ignored(module_name))
   
-  for importer, module_name, is_package in pkgutil.walk_packages(path=[dirpath]):
+  for importer, module_name, is_package in _walk_modules(dirpath, is_ignored):
     if should_append(module_name):
       if is_package:
         sys.path.append(importer.path)
@@ -84,14 +89,41 @@ def run_tests(
   
   stream = _get_output_stream(output_stream)
   
+  if profile:
+    profiler = cProfile.Profile()
+    profiler.enable()
+  
   for module_name in module_names:
     if module_name.split('.')[-1].startswith(test_module_name_prefix):
       module = importlib.import_module(module_name)
       run_test(module, stream=stream)
   
+  if profile:
+    profiler.disable()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(
+      _NUM_PROFILE_STATS_TO_PRINT)
+  
   stream.close()
 
 
+def _walk_modules(dirpath, is_ignored, prefix=''):
+  """
+  Yield `(importer, module name, is package)` tuples for modules in the
+  specified directory path and recursively in its subpackages.
+  
+  Unlike `pkgutil.walk_packages()`, packages are not imported during the walk
+  and packages for which `is_ignored` returns `True` are not descended into.
+  """
+  for importer, module_name, is_package in pkgutil.iter_modules(
+        path=[dirpath], prefix=prefix):
+    yield importer, module_name, is_package
+    
+    if is_package and not is_ignored(module_name):
+      package_dirpath = os.path.join(dirpath, module_name.split('.')[-1])
+      for module_info in _walk_modules(package_dirpath, is_ignored, module_name + '.'):
+        yield module_info
+
+
 def run_test(module, stream=sys.stderr):
   test_suite = unittest.TestLoader().loadTestsFromModule(module)
   test_runner = unittest.TextTestRunner(stream=stream)
@@ -161,6 +193,11 @@ SETTINGS.add([
     'name': 'output_stream',
     'description': 'Output stream',
   },
+  {
+    'type': pg.SettingTypes.boolean,
+    'name': 'profile',
+    'description': 'Whether to profile running the tests',
+  },
 ])
 
 